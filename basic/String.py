@@ -3,6 +3,28 @@ Python String Examples - Comprehensive Guide
 All string operations with detailed explanations
 """
 
+import bisect
+import codecs
+import contextvars
+import csv
+import io
+import itertools
+import json
+import mmap
+import os
+import pickle
+import re
+import string
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
 # =============================================================================
 # 1. STRING CREATION
 # =============================================================================
@@ -63,6 +85,107 @@ print(f"Using f-strings: {message}")
 message2 = "My name is {} and I am {} years old".format(full_name, age)
 print(f"Using format(): {message2}")
 
+# Building large strings - += can copy the whole string on every step, so
+# keep the fragments in a list and only join them when the text is needed
+class StringBuilder:
+    """Collects string fragments; append is O(1), the join happens lazily"""
+
+    def __init__(self, *fragments):
+        self.parts = list(fragments)
+        self.length = sum(map(len, self.parts))
+        self.offsets = None   # Start offset of each part, built on demand
+
+    def append(self, fragment):
+        self.parts.append(fragment)
+        self.length += len(fragment)
+        self.offsets = None
+        return self
+
+    def _locate(self, index):
+        """Return (part number, position inside that part) for a text index"""
+        if self.offsets is None:
+            self.offsets = list(itertools.accumulate(map(len, self.parts), initial=0))
+        part = bisect.bisect_right(self.offsets, index) - 1
+        return part, index - self.offsets[part]
+
+    def insert(self, index, fragment):
+        """Insert fragment at index by splitting only the part that holds it"""
+        if index < 0:                        # Same rules as list.insert()
+            index = max(index + self.length, 0)
+        if index >= self.length:
+            return self.append(fragment)
+        part, pos = self._locate(index)
+        piece = self.parts[part]
+        self.parts[part:part + 1] = [piece[:pos], fragment, piece[pos:]]
+        self.length += len(fragment)
+        self.offsets = None
+        return self
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, key):
+        """Index or slice without building the whole text (step must be 1)"""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step != 1:
+                raise ValueError("StringBuilder slices do not support a step")
+        else:
+            start = key + self.length if key < 0 else key
+            if not 0 <= start < self.length:
+                raise IndexError("StringBuilder index out of range")
+            stop = start + 1
+        if start >= stop:
+            return ""
+        first, first_pos = self._locate(start)
+        last, last_pos = self._locate(stop - 1)
+        if first == last:
+            return self.parts[first][first_pos:last_pos + 1]
+        return "".join([self.parts[first][first_pos:],
+                        *self.parts[first + 1:last],
+                        self.parts[last][:last_pos + 1]])
+
+    def __str__(self):
+        if len(self.parts) > 1:
+            self.parts = ["".join(self.parts)]   # Join once, then reuse it
+            self.offsets = None
+        return self.parts[0] if self.parts else ""
+
+    def write_to(self, file):
+        """Write every fragment to a file without joining them first"""
+        file.writelines(self.parts)
+
+builder = StringBuilder("Hello")
+builder.append(", ").append("World").insert(5, " there")
+print(f"StringBuilder: {builder} (length {len(builder)}, slice [7:12] = {builder[7:12]!r})")
+
+# Compare the ways of building a string from many fragments
+def build_with_plus(fragments):
+    result = ""
+    for fragment in fragments:
+        result += fragment
+    return result
+
+def build_with_stringio(fragments):
+    buffer = io.StringIO()
+    for fragment in fragments:
+        buffer.write(fragment)
+    return buffer.getvalue()
+
+def build_with_builder(fragments):
+    builder = StringBuilder()
+    for fragment in fragments:
+        builder.append(fragment)
+    return str(builder)
+
+# Raise the sizes up to 10**7 for a full benchmark
+for size in (10**3, 10**5):
+    fragments = ["row %d\n" % i for i in range(size)]
+    for build in (build_with_plus, "".join, build_with_stringio, build_with_builder):
+        seconds = timeit.timeit(lambda: build(fragments), number=1)
+        name = getattr(build, "__name__", "join")
+        print(f"  {size:>7} fragments, {name}: {seconds:.4f}s")
+
 # =============================================================================
 # 3. STRING INDEXING AND SLICING
 # =============================================================================
@@ -116,6 +239,129 @@ print(f"capitalize(): {text.capitalize()}") # First char uppercase
 print(f"title(): {text.title()}")           # Title case
 print(f"swapcase(): {text.swapcase()}")     # Swap case
 
+# Changing the case of whole files - for ASCII data a 256-byte table and
+# bytes.translate() do it without decoding; only chunks that contain other
+# characters go through the Unicode str methods. Chunks end at whitespace
+# so context-dependent rules like the Greek final sigma see whole words.
+# (title() and capitalize() depend on the previous character, so they are
+# left out.)
+UPPERCASE = string.ascii_uppercase.encode()
+LOWERCASE = string.ascii_lowercase.encode()
+CASE_TABLES = {
+    "lower": bytes.maketrans(UPPERCASE, LOWERCASE),
+    "upper": bytes.maketrans(LOWERCASE, UPPERCASE),
+    "swapcase": bytes.maketrans(UPPERCASE + LOWERCASE, LOWERCASE + UPPERCASE),
+}
+
+def utf8_boundaries(buffer, chunk_size):
+    """Chunk edges moved back to whitespace, else so no UTF-8 character is cut in two
+
+    Casing can depend on the neighbouring letters (lower() turns a final
+    "Σ" into "ς"), so edges go at whitespace where the chunk has some.
+    Only a word longer than chunk_size is still split, and may convert
+    differently than the whole text would.
+    """
+    edges = [0]
+    while edges[-1] + chunk_size < len(buffer):
+        edge = edges[-1] + chunk_size
+        space = max(buffer.rfind(c, edges[-1], edge) for c in (b" ", b"\n", b"\t", b"\r"))
+        if space >= 0:               # Cut just after the last whitespace
+            edges.append(space + 1)
+            continue
+        while edge > edges[-1] and buffer[edge] & 0xC0 == 0x80:   # Continuation byte
+            edge -= 1
+        if edge == edges[-1]:        # Chunk smaller than one character: take it whole
+            edge += 1
+            while edge < len(buffer) and buffer[edge] & 0xC0 == 0x80:
+                edge += 1
+            if edge == len(buffer):
+                break
+        edges.append(edge)
+    edges.append(len(buffer))
+    return list(zip(edges, edges[1:]))
+
+def _changed_case(chunk, mode, start, end):
+    """Non-ASCII chunk converted through str, refusing length changes (e.g. "ﬁ" -> "FI")"""
+    converted = getattr(chunk.decode("utf-8"), mode)().encode("utf-8")
+    if len(converted) != len(chunk):
+        raise ValueError(f"{mode}() changes the length of bytes {start}-{end}")
+    return converted
+
+def _check_case_change(buffer, mode, ranges):
+    """Raise ValueError before anything is written if a chunk cannot be converted"""
+    for start, end in ranges:
+        chunk = buffer[start:end]
+        if not chunk.isascii():
+            _changed_case(chunk, mode, start, end)
+
+def convert_case(buffer, mode="lower", chunk_size=1024 * 1024):
+    """Change the case of UTF-8 text in a bytearray or writable mmap, in place
+
+    Every non-ASCII chunk is checked first, so a ValueError leaves the
+    buffer untouched (at the cost of converting those chunks twice).
+    """
+    table = CASE_TABLES[mode]
+    ranges = utf8_boundaries(buffer, chunk_size)
+    _check_case_change(buffer, mode, ranges)
+    for start, end in ranges:
+        chunk = buffer[start:end]
+        if chunk.isascii():
+            buffer[start:end] = chunk.translate(table)
+        else:
+            buffer[start:end] = _changed_case(chunk, mode, start, end)
+
+def _check_file_range(path, mode, start, end):
+    """Worker: validate one range of a file through a read-only mmap"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        chunk = mm[start:end]
+    _check_case_change(chunk, mode, utf8_boundaries(chunk, 1024 * 1024))
+
+def _convert_file_range(path, mode, start, end):
+    """Worker: convert one range of a file through its own writable mmap"""
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+        view = memoryview(mm)[start:end]
+        try:
+            chunk = bytearray(view)
+            convert_case(chunk, mode)
+            view[:] = chunk
+        finally:
+            view.release()
+
+def convert_case_file(path, mode="lower", workers=None, chunk_size=16 * 1024 * 1024):
+    """Change the case of a UTF-8 file in place, one chunk per worker task
+
+    All ranges are validated before any worker writes, so a ValueError
+    leaves the file unchanged.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        ranges = utf8_boundaries(mm, chunk_size)
+    starts, ends = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for task in (_check_file_range, _convert_file_range):
+            list(pool.map(task, itertools.repeat(path), itertools.repeat(mode), starts, ends))
+
+data = bytearray("Python Programming ÄÖÜ".encode("utf-8"))
+convert_case(data, "lower", chunk_size=8)
+print(f"convert_case lower: {data.decode('utf-8')}")
+convert_case(data, "swapcase")
+print(f"convert_case swapcase: {data.decode('utf-8')}")
+greek = "ΟΔΟΣ ΠΟΛΙΣ ΟΔΥΣΣΕΥΣ"
+for size in (16, 24, 64):                        # At least the longest word (16 bytes)
+    data = bytearray(greek.encode("utf-8"))
+    convert_case(data, "lower", chunk_size=size)
+    assert data.decode("utf-8") == greek.lower(), size
+print(f"convert_case lower (final sigma): {data.decode('utf-8')}")
+
+if __name__ == "__main__":
+    with tempfile.NamedTemporaryFile("wb", delete=False) as tmp:
+        tmp.write("Mixed Case Line, café\n".encode("utf-8") * 200_000)
+    convert_case_file(tmp.name, "upper", chunk_size=512 * 1024)
+    with open(tmp.name, "rb") as f:
+        print(f"convert_case_file upper: {f.readline().decode('utf-8')!r}")
+    os.remove(tmp.name)
+
 # =============================================================================
 # 6. STRING METHODS - SEARCHING AND CHECKING
 # =============================================================================
@@ -145,6 +391,137 @@ print(f"endswith('powerful'): {text.endswith('powerful')}")
 print(f"'fun' in text: {'fun' in text}")
 print(f"'Java' in text: {'Java' in text}")
 
+# Many searches in the same text - sort all suffixes once (a suffix array),
+# then every query is a binary search instead of a scan of the whole text.
+# Offsets are stored as "q" (8-byte) arrays so saved indexes have the same
+# layout on every platform ("l" is 4 bytes on Windows)
+class SubstringIndex:
+    """Suffix array + LCP array over a str, bytes or mmap"""
+
+    def __init__(self, text, suffixes=None):
+        self.text = text
+        self.suffixes = suffixes if suffixes is not None else self._build(text)
+        self._lcp = None
+
+    @staticmethod
+    def _build(text):
+        """Prefix doubling: sort suffixes by their first 1, 2, 4, ... characters"""
+        n = len(text)
+        symbols = text if isinstance(text, str) else text[:]
+        alphabet = {c: r for r, c in enumerate(sorted(set(symbols)))}
+        rank = [alphabet[c] for c in symbols]
+        suffixes = list(range(n))
+        k = 1
+        while n:
+            key = lambda i: (rank[i], rank[i + k] if i + k < n else -1)
+            suffixes.sort(key=key)
+            new_rank = [0] * n
+            for prev, cur in zip(suffixes, suffixes[1:]):
+                new_rank[cur] = new_rank[prev] + (key(prev) != key(cur))
+            rank = new_rank
+            if rank[suffixes[-1]] == n - 1:   # All suffixes told apart
+                break
+            k *= 2
+        return array("q", suffixes)
+
+    @property
+    def lcp(self):
+        """lcp[i] = common prefix length of suffixes i-1 and i (Kasai)"""
+        if self._lcp is None:
+            n = len(self.text)
+            rank = [0] * n
+            for i, start in enumerate(self.suffixes):
+                rank[start] = i
+            self._lcp = lcp = array("q", bytes(n * array("q").itemsize))
+            h = 0
+            for start in range(n):
+                if rank[start] > 0:
+                    other = self.suffixes[rank[start] - 1]
+                    while (start + h < n and other + h < n
+                           and self.text[start + h] == self.text[other + h]):
+                        h += 1
+                    lcp[rank[start]] = h
+                    h = max(h - 1, 0)
+                else:
+                    h = 0
+        return self._lcp
+
+    def _range(self, pattern):
+        """Range of suffix array entries that start with pattern"""
+        m = len(pattern)
+        key = lambda start: self.text[start:start + m]
+        low = bisect.bisect_left(self.suffixes, pattern, key=key)
+        high = bisect.bisect_right(self.suffixes, pattern, lo=low, key=key)
+        return low, high
+
+    def count(self, pattern):
+        """Number of occurrences, overlapping ones included (unlike str.count)"""
+        if not pattern:                          # Matches at every position, as in str
+            return len(self.text) + 1
+        low, high = self._range(pattern)
+        return high - low
+
+    def find_all(self, pattern):
+        if not pattern:
+            return list(range(len(self.text) + 1))
+        low, high = self._range(pattern)
+        return sorted(self.suffixes[low:high])
+
+    def find(self, pattern):
+        if not pattern:
+            return 0
+        low, high = self._range(pattern)
+        return min(self.suffixes[low:high], default=-1)
+
+    def longest_repeated(self):
+        """Longest substring that occurs at least twice"""
+        if len(self.text) < 2:
+            return self.text[:0]
+        length, i = max((h, i) for i, h in enumerate(self.lcp))
+        return self.text[self.suffixes[i]:self.suffixes[i] + length]
+
+    def save(self, path):
+        """Write the suffix array only; the text (often an mmap) stays where it is"""
+        with open(path, "wb") as f:
+            self.suffixes.tofile(f)
+
+    @classmethod
+    def load(cls, path, text):
+        """Reattach a saved suffix array to its text without sorting again"""
+        suffixes = array("q")
+        with open(path, "rb") as f:
+            suffixes.fromfile(f, os.path.getsize(path) // suffixes.itemsize)
+        if len(suffixes) != len(text):
+            raise ValueError(f"Index has {len(suffixes)} suffixes, text has {len(text)} characters")
+        return cls(text, suffixes)
+
+index = SubstringIndex(text)
+print(f"Index find('Python'): {index.find('Python')}, count('is'): {index.count('is')}")
+print(f"Index find_all('Python'): {index.find_all('Python')}")
+print(f"Longest repeated substring: {index.longest_repeated()!r}")
+
+# Build once, then compare query time with the plain str methods
+corpus = " ".join(f"word{i * 7919 % 1000}" for i in range(2000))
+seconds = timeit.timeit(lambda: SubstringIndex(corpus), number=1)
+print(f"  Building index over {len(corpus)} characters: {seconds:.3f}s")
+with tempfile.TemporaryDirectory() as folder:
+    path = os.path.join(folder, "corpus.idx")
+    SubstringIndex(corpus).save(path)
+    corpus_index = SubstringIndex.load(path, corpus)
+    # Same for a memory-mapped file: save the index, map the file again, load
+    text_path = os.path.join(folder, "corpus.txt")
+    with open(text_path, "wb") as f:
+        f.write(corpus.encode())
+    with open(text_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        SubstringIndex(mm).save(path)
+    with open(text_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        print(f"  mmap index reloaded, count(b'word7'): {SubstringIndex.load(path, mm).count(b'word7')}")
+queries = [f"word{i}" for i in range(0, 1000, 10)]
+seconds = timeit.timeit(lambda: [corpus.count(q) for q in queries], number=1)
+print(f"  str.count for {len(queries)} queries: {seconds:.4f}s")
+seconds = timeit.timeit(lambda: [corpus_index.count(q) for q in queries], number=1)
+print(f"  SubstringIndex.count for {len(queries)} queries: {seconds:.4f}s")
+
 # =============================================================================
 # 7. STRING METHODS - CHECKING STRING TYPES
 # =============================================================================
@@ -177,6 +554,65 @@ print(f"'hello'.islower(): {'hello'.islower()}")
 print(f"'Python Programming'.istitle(): {'Python Programming'.istitle()}")
 print(f"'python programming'.istitle(): {'python programming'.istitle()}")
 
+# Guessing CSV column types - instead of checking one token at a time, join
+# a chunk of the column with newlines and let one regex count the matches
+TOKEN_TYPES = {   # Most specific first
+    "bool": re.compile(r"^(?:true|false|yes|no|True|False|Yes|No|TRUE|FALSE)$", re.M),
+    "int": re.compile(r"^[+-]?\d+$", re.M),
+    "float": re.compile(r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$", re.M),
+    "date": re.compile(r"^(?:\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4})$", re.M),
+}
+
+def classify_column(tokens, threshold=0.95, chunk_size=1000, max_rows=None,
+                    settle_after=10_000):
+    """Return (type, confidence) for a column of string tokens
+
+    Empty tokens are ignored. A type needs at least `threshold` of the other
+    tokens to match it; otherwise the column is "text". Checking stops early
+    once no type except text is still possible, or once `settle_after`
+    non-empty tokens have been checked and a type still passes (the rest of
+    the column is then assumed to follow it; None checks every token).
+    """
+    tokens = iter(itertools.islice(tokens, max_rows))
+    matches = dict.fromkeys(TOKEN_TYPES, 0)
+    possible = list(TOKEN_TYPES)
+    checked = 0
+    while possible and (settle_after is None or checked < settle_after):
+        raw = list(itertools.islice(tokens, chunk_size))
+        if not raw:
+            break
+        chunk = [t for t in raw if t]                # A chunk of blanks is not the end
+        if not chunk:
+            continue
+        joined = "\n".join(chunk)
+        if joined.count("\n") != len(chunk) - 1:   # Multi-line cells are text
+            joined = "\n".join(t.replace("\n", " ") for t in chunk)
+        checked += len(chunk)
+        for name in possible:
+            matches[name] += len(TOKEN_TYPES[name].findall(joined))
+        # Types that already missed too often are not checked any more
+        possible = [name for name in possible if matches[name] >= threshold * checked]
+    if checked == 0:
+        return "text", 0.0
+    if possible:
+        return possible[0], matches[possible[0]] / checked
+    return "text", 1 - max(matches.values()) / checked
+
+def infer_schema(header, rows, workers=None, **options):
+    """Infer {column: (type, confidence)}, one column per worker process"""
+    columns = list(zip(*rows))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(partial(classify_column, **options), columns)
+        return dict(zip(header, results))
+
+csv_text = "id,price,active,joined,name\n1,9.99,yes,2024-01-05,Ann\n2,12,no,2024-02-11,Bob\n3,,true,05/03/2024,Cy\n"
+header, *csv_rows = csv.reader(io.StringIO(csv_text))
+for name, column in zip(header, zip(*csv_rows)):
+    print(f"  Column {name!r}: {classify_column(column)}")
+
+if __name__ == "__main__":
+    print(f"Inferred schema: {infer_schema(header, csv_rows * 10_000)}")
+
 # =============================================================================
 # 8. STRING METHODS - TRIMMING AND PADDING
 # =============================================================================
@@ -213,6 +649,49 @@ print(f"rjust(30): '{text.strip().rjust(30)}'")
 number = "42"
 print(f"zfill(5): '{number.zfill(5)}'")
 
+# Printing large aligned tables - find the column widths once, turn them into
+# one row template, then pad a whole row with a single format() call
+def column_widths(rows):
+    """Width of the widest cell in each column (rows must be equally long)"""
+    return [max(map(len, map(str, column))) for column in zip(*rows)]
+
+def _check_row_lengths(rows, columns, first_index=0):
+    for i, row in enumerate(rows, first_index):
+        if len(row) != columns:
+            raise ValueError(f"Row {i} has {len(row)} cells, expected {columns}")
+
+def write_table(rows, sink, aligns=None, sample_size=None, batch_size=1000):
+    """Write rows as aligned text columns to any file-like sink
+
+    Without sample_size every row is read into memory to measure the columns.
+    With sample_size only that many rows are measured and kept, the rest are
+    streamed, and longer cells later on overflow their column (never cut).
+    Every row must have as many cells as the first one (ValueError otherwise).
+    """
+    rows = iter(rows)
+    head = list(itertools.islice(rows, sample_size)) if sample_size else list(rows)
+    if not head:
+        return
+    columns = len(head[0])
+    _check_row_lengths(head, columns)
+    widths = column_widths(head)
+    aligns = aligns or "<" * columns
+    if len(aligns) != columns:
+        raise ValueError(f"{len(aligns)} alignments given for {columns} columns")
+    template = " | ".join(f"{{:{align}{width}}}"
+                          for align, width in zip(aligns, widths)) + "\n"
+    sink.write("".join(template.format(*map(str, row)) for row in head))
+    written = len(head)
+    while batch := list(itertools.islice(rows, batch_size)):
+        _check_row_lengths(batch, columns, written)
+        sink.write("".join(template.format(*map(str, row)) for row in batch))
+        written += len(batch)
+
+table = [("Name", "Language", "Stars"), ("requests", "Python", 51000),
+         ("flask", "Python", 66000), ("express", "JavaScript", 1234567)]
+write_table(table, sys.stdout, aligns="<<>")
+write_table(table, sys.stdout, aligns="<<>", sample_size=2)
+
 # =============================================================================
 # 9. STRING METHODS - SPLITTING AND JOINING
 # =============================================================================
@@ -236,6 +715,81 @@ multiline = "Line 1\nLine 2\nLine 3"
 lines = multiline.splitlines()
 print(f"splitlines(): {lines}")
 
+# Lazy splitting of huge files - re.finditer() works directly on bytes or an
+# mmap, so tokens are produced one at a time instead of as one big list
+def iter_tokens(buffer, separators=b" \t\r\n", start=0, end=None, zero_copy=False):
+    """Yield the tokens of buffer[start:end] split on any separator byte
+
+    With zero_copy=True the tokens are memoryview slices of buffer.
+    """
+    pattern = re.compile(b"[^" + re.escape(separators) + b"]+")
+    view = memoryview(buffer) if zero_copy else buffer
+    end = len(buffer) if end is None else end
+    for match in pattern.finditer(buffer, start, end):
+        yield view[match.start():match.end()]
+
+def iter_lines(buffer, zero_copy=False):
+    """Yield the non-empty lines of buffer without their line breaks"""
+    return iter_tokens(buffer, b"\n", zero_copy=zero_copy)
+
+def token_boundaries(buffer, chunk_size, separators=b" \t\r\n"):
+    """Split buffer into (start, end) ranges that never cut a token in two"""
+    boundaries = [0]
+    while boundaries[-1] + chunk_size < len(buffer):
+        position = boundaries[-1] + chunk_size
+        # Move the boundary forward to the next separator
+        while position < len(buffer) and buffer[position:position + 1] not in separators:
+            position += 1
+        boundaries.append(position)
+    boundaries.append(len(buffer))
+    return list(zip(boundaries, boundaries[1:]))
+
+def _tokens_of_range(path, start, end, separators):
+    """Worker: list of the tokens in one range of a memory-mapped file"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return list(iter_tokens(mm, separators, start, end))
+
+def split_file_parallel(path, separators=b" \t\r\n", workers=None,
+                        chunk_size=16 * 1024 * 1024, prefetch=None):
+    """Yield every token of a file, splitting the chunks in a process pool
+
+    At most `prefetch` ranges (default: two per worker) are in flight, so
+    finished token lists do not pile up when the caller consumes slowly.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        ranges = token_boundaries(mm, chunk_size, separators)
+    workers = workers or os.cpu_count() or 1
+    prefetch = prefetch or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        try:
+            for start, end in ranges:
+                pending.append(pool.submit(_tokens_of_range, path, start, end, separators))
+                if len(pending) >= prefetch:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:                                 # Caller stopped early
+            for future in pending:
+                future.cancel()
+
+with tempfile.TemporaryFile() as tmp:
+    tmp.write(b"Line 1 alpha\nLine 2 beta\nLine 3 gamma\n")
+    tmp.flush()
+    with mmap.mmap(tmp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        print(f"Lazy lines from mmap: {[bytes(line) for line in iter_lines(mm, zero_copy=True)]}")
+        print(f"Lazy tokens from mmap: {list(itertools.islice(iter_tokens(mm), 4))}")
+        print(f"Token-safe chunk ranges: {token_boundaries(mm, 10)}")
+
+if __name__ == "__main__":
+    with tempfile.NamedTemporaryFile("wb", delete=False) as tmp:
+        tmp.write(b"alpha beta\tgamma\n" * 100_000)
+    tokens = sum(1 for _ in split_file_parallel(tmp.name, chunk_size=256 * 1024))
+    os.remove(tmp.name)
+    print(f"Parallel split: {tokens} tokens")
+
 # join() - join list into string
 joined = " ".join(words)
 print(f"join(): {joined}")
@@ -268,6 +822,98 @@ translation_table = str.maketrans("aeiou", "12345")
 text2 = "hello world"
 print(f"translate(): {text2.translate(translation_table)}")
 
+# Many replacements at once - every chained replace() copies the whole text,
+# so compile all the rules into one regex shaped like a trie and replace
+# everything in a single pass
+def trie_regex(words):
+    """Regex matching any of words, preferring the longest at each position"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True   # A word ends here
+
+    def build(node):
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy "?" tries the longer words first, then stops at this one
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+class MultiReplacer:
+    """Replaces every rule key with its value, leftmost-longest match first
+
+    Instances can be pickled, e.g. to send them to worker processes.
+    """
+
+    def __init__(self, rules):
+        if "" in rules:
+            raise ValueError("Replacement rules cannot have an empty key")
+        self.rules = dict(rules)
+        # "(?!)" never matches, for an empty rule set
+        self.pattern = re.compile(trie_regex(self.rules) or "(?!)")
+        self.longest = max(map(len, self.rules), default=0)
+
+    def _replacement(self, match):
+        return self.rules[match.group()]
+
+    def replace(self, text):
+        return self.pattern.sub(self._replacement, text)
+
+    def replace_stream(self, source, sink, chunk_size=64 * 1024):
+        """Replace while copying source to sink one chunk at a time
+
+        The last longest-1 characters of each chunk are held back, so a
+        match that starts there can still see the characters that follow.
+        """
+        carry = ""
+        while True:
+            chunk = source.read(chunk_size)
+            data = carry + chunk
+            # Matches starting before cut are complete; later ones may grow
+            cut = len(data) if not chunk else max(len(data) - self.longest + 1, 0)
+            last = 0
+            for match in self.pattern.finditer(data):
+                if match.start() >= cut:
+                    break
+                sink.write(data[last:match.start()])
+                sink.write(self.rules[match.group()])
+                last = match.end()
+            if last < cut:
+                sink.write(data[last:cut])
+                last = cut
+            carry = data[last:]
+            if not chunk:
+                return
+
+@lru_cache(maxsize=32)
+def compiled_replacer(rules):
+    """Cached MultiReplacer for a tuple of (old, new) pairs"""
+    return MultiReplacer(dict(rules))
+
+replacer = compiled_replacer((("Python", "JavaScript"), ("Py", "JS"), ("is", "was")))
+print(f"Multi replace: {replacer.replace('Python is great. Py is short.')}")
+sink = io.StringIO()
+replacer.replace_stream(io.StringIO("Python is great. " * 3), sink, chunk_size=7)
+print(f"Streamed multi replace: {sink.getvalue()}")
+print(f"Pickles for worker processes: {pickle.loads(pickle.dumps(replacer)).replace('Py')}")
+
+rules = {f"word{i}": f"<{i}>" for i in range(500)}
+document = " ".join(f"word{i * 37 % 600}" for i in range(20000))
+def chained_replace(text):
+    for old in sorted(rules, key=len, reverse=True):
+        text = text.replace(old, rules[old])
+    return text
+seconds = timeit.timeit(lambda: chained_replace(document), number=1)
+print(f"  500 chained replace() calls: {seconds:.4f}s")
+seconds = timeit.timeit(lambda: MultiReplacer(rules).replace(document), number=1)
+print(f"  MultiReplacer (compile + replace): {seconds:.4f}s")
+
 # =============================================================================
 # 11. STRING FORMATTING
 # =============================================================================
@@ -300,6 +946,45 @@ print(f"Percentage: {0.85:.1%}")
 print(f"Scientific notation: {number:.2e}")
 print(f"Padding: {number:10.2f}")
 
+# Rendering many rows with the same template - bind template.format once
+# (with the newline folded into the template) and let starmap() call it for
+# every row, instead of a generator that looks the method up per row.
+# A "compile the template once" renderer (Formatter().parse up front, then
+# format(value, spec) per field) does not help in CPython: str.format already
+# parses the template in C, and redoing the field loop in Python is slower -
+# the timing below shows it
+def render_rows(template, rows, file=None, batch_size=10000):
+    """Render every row tuple, one line each, into one string or into file"""
+    render = (template + "\n").format
+    if file is None:
+        return "".join(itertools.starmap(render, rows))
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, batch_size)):
+        file.write("".join(itertools.starmap(render, batch)))
+
+report_rows = [("Alice", 30, 5.6), ("Bob", 25, 6.1)]
+print(render_rows("{:<6}|{:>4}|{:6.2f}", report_rows), end="")
+
+def _render_parsed(template, rows):
+    """Parse-once renderer, kept only to compare against render_rows"""
+    fields = [(literal, int(name), spec)
+              for literal, name, spec, _ in string.Formatter().parse(template)
+              if name is not None]
+    tail = template.rsplit("}", 1)[1] + "\n"
+    return "".join(
+        "".join(literal + format(row[index], spec) for literal, index, spec in fields) + tail
+        for row in rows)
+
+rows = [(f"item{i}", i, i * 1.5) for i in range(10**5)]
+template = "{0:<10} {1:>8d} {2:>12.2f}"
+assert _render_parsed(template, rows[:100]) == render_rows(template, rows[:100])
+seconds = timeit.timeit(lambda: "\n".join(template.format(*row) for row in rows), number=1)
+print(f"  str.format generator: {len(rows) / seconds:,.0f} rows/s")
+seconds = timeit.timeit(lambda: _render_parsed(template, rows), number=1)
+print(f"  parse-once renderer: {len(rows) / seconds:,.0f} rows/s")
+seconds = timeit.timeit(lambda: render_rows(template, rows), number=1)
+print(f"  render_rows: {len(rows) / seconds:,.0f} rows/s")
+
 # =============================================================================
 # 12. STRING ESCAPE CHARACTERS
 # =============================================================================
@@ -328,6 +1013,52 @@ print("She said \"Hello\"")
 print("\nRaw string: r'C:\\Users\\Documents'")
 print(r'C:\Users\Documents')
 
+# Escaping text for CSV and JSON export - most fields contain nothing that
+# needs escaping, so one regex search decides whether a field can be written
+# as it is, and only the rest are escaped
+CSV_SPECIAL = re.compile(r'[",\r\n]')
+JSON_SPECIAL = re.compile(r'[\x00-\x1f"\\]')
+
+def escape_csv_field(field):
+    if not CSV_SPECIAL.search(field):
+        return field
+    return '"' + field.replace('"', '""') + '"'
+
+def unescape_csv_field(field):
+    if not field.startswith('"'):
+        return field
+    return field[1:-1].replace('""', '"')
+
+def escape_json_string(field):
+    if not JSON_SPECIAL.search(field):
+        return f'"{field}"'
+    return json.encoder.encode_basestring(field)   # C implementation
+
+def unescape_json_string(quoted):
+    if "\\" not in quoted:
+        return quoted[1:-1]
+    return json.loads(quoted)
+
+def write_escaped_rows(rows, sink, style="csv", batch_size=10000):
+    """Stream rows of text fields to sink as CSV lines or JSON arrays"""
+    if style == "csv":
+        render = lambda row: ",".join(map(escape_csv_field, row))
+    else:
+        render = lambda row: "[" + ",".join(map(escape_json_string, row)) + "]"
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, batch_size)):
+        sink.write("\n".join(map(render, batch)))
+        sink.write("\n")
+
+export_rows = [("plain", 'She said "Hello"'), ("a,b", "C:\\Users\\Documents\tTab\nLine")]
+for fmt in ("csv", "json"):
+    buffer = io.StringIO()
+    write_escaped_rows(export_rows, buffer, fmt)
+    print(f"Escaped as {fmt}:\n{buffer.getvalue()}", end="")
+field = 'say "hi", then\ttab'
+print(f"Round trip CSV: {unescape_csv_field(escape_csv_field(field)) == field}")
+print(f"Round trip JSON: {unescape_json_string(escape_json_string(field)) == field}")
+
 # =============================================================================
 # 13. STRING ITERATION
 # =============================================================================
@@ -411,6 +1142,56 @@ word2 = "python"
 print(f"Is '{word1}' a palindrome? {is_palindrome(word1)}")
 print(f"Is '{word2}' a palindrome? {is_palindrome(word2)}")
 
+# Batch palindrome check - ASCII strings (the common case for product codes)
+# are folded to lowercase and stripped of spaces by one bytes.translate()
+# call with a precomputed table. str.translate() goes through a dict lookup
+# per character and is slower than lower() + replace(), so only non-ASCII
+# strings take that route
+PALINDROME_TABLE = bytes.maketrans(string.ascii_uppercase.encode(),
+                                   string.ascii_lowercase.encode())
+
+def check_palindromes(strings):
+    """Yield True/False for each string of any iterable, e.g. an open file"""
+    for s in strings:
+        s = s.rstrip("\n")
+        if s.isascii():
+            s = s.encode().translate(PALINDROME_TABLE, b" ")
+        else:
+            s = s.lower().replace(" ", "")
+        yield s == s[::-1]
+
+codes = ["Level", "Step on no pets", "ABC123", "Nurses run"]
+for code, result in zip(codes, check_palindromes(codes)):
+    print(f"  {code!r}: {result}")
+
+# Longest palindromic substring in linear time (Manacher's algorithm)
+def longest_palindrome(s):
+    """Return the longest palindromic substring of s"""
+    if not s:
+        return ""
+    t = "^#" + "#".join(s) + "#$"   # Sentinels avoid bounds checks
+    radius = [0] * len(t)
+    center = right = 0
+    for i in range(1, len(t) - 1):
+        if i < right:
+            radius[i] = min(right - i, radius[2 * center - i])
+        while t[i + radius[i] + 1] == t[i - radius[i] - 1]:
+            radius[i] += 1
+        if i + radius[i] > right:
+            center, right = i, i + radius[i]
+    length, i = max((r, i) for i, r in enumerate(radius))
+    start = (i - length) // 2
+    return s[start:start + length]
+
+print(f"Longest palindrome in 'forgeeksskeegfor': {longest_palindrome('forgeeksskeegfor')}")
+
+# Compare both versions (raise n to 10**6 or 10**7 for a full benchmark)
+sample_codes = ["Step on no pets", "ABC123XYZ", "racecar", "Python"] * 2500
+seconds = timeit.timeit(lambda: [is_palindrome(c) for c in sample_codes], number=1)
+print(f"  is_palindrome: {len(sample_codes)} strings in {seconds:.4f}s")
+seconds = timeit.timeit(lambda: list(check_palindromes(sample_codes)), number=1)
+print(f"  check_palindromes: {len(sample_codes)} strings in {seconds:.4f}s")
+
 # Remove duplicates while preserving order
 def remove_duplicates(s):
     seen = set()
@@ -424,6 +1205,50 @@ def remove_duplicates(s):
 text = "programming"
 print(f"Remove duplicates from '{text}': {remove_duplicates(text)}")
 
+# Streaming version for huge files - read fixed-size chunks, keep the `seen`
+# state between chunks and write each chunk's new characters straight away
+def remove_duplicates_stream(source, sink, chunk_size=64 * 1024):
+    """Copy the first occurrence of each character from source to sink
+
+    source can be any file-like object (text or binary), including a
+    socket wrapped with socket.makefile('rb').
+    """
+    chunk = source.read(chunk_size)
+    binary = isinstance(chunk, bytes)
+    if binary:
+        seen = bytearray(256)       # Bitmap: one flag per possible byte value
+        remaining = 256
+    else:
+        seen = set()
+    while chunk:
+        # set() and find() run in C, so there is no Python loop per character
+        if binary:
+            new = [b for b in set(chunk) if not seen[b]]
+        else:
+            new = list(set(chunk) - seen)
+        new.sort(key=chunk.find)
+        if binary:
+            for b in new:
+                seen[b] = 1
+            sink.write(bytes(new))
+            remaining -= len(new)
+            if remaining == 0:      # Every byte value has been written
+                return
+        else:
+            seen.update(new)
+            sink.write("".join(new))
+        chunk = source.read(chunk_size)
+
+source = io.StringIO("programming " * 1000)
+sink = io.StringIO()
+remove_duplicates_stream(source, sink, chunk_size=16)
+print(f"Streamed (text): {sink.getvalue()!r}")
+
+source = io.BytesIO(b"mississippi banana " * 1000)
+sink = io.BytesIO()
+remove_duplicates_stream(source, sink, chunk_size=16)
+print(f"Streamed (bytes): {sink.getvalue()!r}")
+
 # Count vowels and consonants
 def count_vowels_consonants(s):
     vowels = "aeiouAEIOU"
@@ -435,6 +1260,66 @@ text = "Python Programming"
 v, c = count_vowels_consonants(text)
 print(f"In '{text}': Vowels = {v}, Consonants = {c}")
 
+# Character histogram for large files - text uses only a few dozen distinct
+# bytes, and bytes.count() scans for one of them far faster than Counter()
+# steps through the data, so one count() per byte value seen in a sample
+# wins while the alphabet is small (measured: ~24 vs ~13 MB/s on ASCII
+# text). Past ~64 values (binary data) Counter() is faster, and it is also
+# the fallback when the sample missed a value. Chunk counts are then merged
+def byte_histogram(data, sample_size=65536, max_alphabet=64):
+    """Return a Counter mapping byte value -> number of occurrences"""
+    alphabet = set(data[:sample_size])
+    if len(alphabet) <= max_alphabet:
+        counts = Counter({value: data.count(bytes((value,))) for value in alphabet})
+        if counts.total() == len(data):          # Every byte value was in the sample
+            return counts
+    return Counter(data)
+
+def _histogram_of_range(path, start, end):
+    """Worker: histogram of bytes start..end of a memory-mapped file"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return byte_histogram(mm[start:end])
+
+def file_histogram(path, workers=None, chunk_size=64 * 1024 * 1024):
+    """Count every byte of a file, spreading the chunks over a process pool"""
+    size = os.path.getsize(path)
+    starts = range(0, size, chunk_size)
+    ends = [min(start + chunk_size, size) for start in starts]
+    total = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for counts in pool.map(_histogram_of_range, itertools.repeat(path), starts, ends):
+            total.update(counts)
+    return total
+
+def vowels_consonants_from_histogram(histogram):
+    """Reduce a byte histogram to (vowels, consonants) for ASCII letters"""
+    vowels = sum(histogram[b] for b in b"aeiouAEIOU")
+    letters = sum(histogram[b] for b in string.ascii_letters.encode())
+    return vowels, letters - vowels
+
+histogram = byte_histogram(b"Python Programming")
+assert histogram == Counter(b"Python Programming")
+print(f"Histogram: {', '.join(f'{chr(b)}={n}' for b, n in sorted(histogram.items()))}")
+v, c = vowels_consonants_from_histogram(histogram)
+print(f"From histogram: Vowels = {v}, Consonants = {c}")
+sample = b"Python Programming\n" * 200_000
+for label, count in (("Counter", Counter), ("byte_histogram", byte_histogram)):
+    seconds = timeit.timeit(lambda: count(sample), number=1)
+    print(f"  {label}: {len(sample) / seconds / 2**20:.0f} MB/s")
+
+# Process pools start fresh interpreters on Windows/macOS, which re-import this
+# file, so the pool is only started from the main script
+if __name__ == "__main__":
+    with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as tmp:
+        tmp.write(b"Python Programming\n" * 500_000)
+    start = time.perf_counter()
+    histogram = file_histogram(tmp.name, chunk_size=1024 * 1024)
+    seconds = time.perf_counter() - start
+    os.remove(tmp.name)
+    v, c = vowels_consonants_from_histogram(histogram)
+    size_mb = sum(histogram.values()) / 1024 / 1024
+    print(f"File: Vowels = {v}, Consonants = {c} ({size_mb / seconds:.1f} MB/s)")
+
 # =============================================================================
 # 17. STRING ENCODING AND DECODING
 # =============================================================================
@@ -457,6 +1342,121 @@ print(f"Decoded: {decoded}")
 encoded_ascii = text.encode('ascii')
 print(f"Encoded (ASCII): {encoded_ascii}")
 
+# Converting large files - incremental encoders/decoders keep state across
+# chunk boundaries, so a multi-byte character split between two reads is fine
+ASCII_COMPATIBLE = {"utf-8", "iso8859-1", "ascii"}
+# The "collect" handler appends to the list of the transcode_stream() call
+# running in the current thread (a ContextVar, so concurrent calls do not mix)
+_conversion_errors = contextvars.ContextVar("conversion_errors")
+
+def collect_conversion_error(error):
+    """Error handler: record (start, end, reason) and write one '?' per bad character"""
+    # CPython reuses one exception object for every error in a call, so copy
+    # the fields now instead of keeping the object
+    _conversion_errors.get().append((error.start, error.end, error.reason))
+    if isinstance(error, UnicodeEncodeError):   # A run of characters, one '?' each
+        return "?" * (error.end - error.start), error.end
+    return "?", error.end
+
+codecs.register_error("collect", collect_conversion_error)
+
+# Byte lengths of decoded characters are measured with a codec that adds no
+# byte order mark, so offsets do not depend on where a chunk starts
+BOMS = {"utf-16": (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE),
+        "utf-32": (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE),
+        "utf-8-sig": (codecs.BOM_UTF8,)}
+STATELESS = {"utf-16": "utf-16-le", "utf-32": "utf-32-le", "utf-8-sig": "utf-8"}
+
+def transcode_stream(source, sink, from_encoding, to_encoding, chunk_size=64 * 1024):
+    """Copy a binary stream to sink in a new encoding
+
+    Returns a sorted list of (byte_offset, reason): one entry per byte
+    sequence that could not be decoded and one per character that could
+    not be encoded. Each of those is written as a single '?'.
+    """
+    decoder = codecs.getincrementaldecoder(from_encoding)("collect")
+    encoder = codecs.getincrementalencoder(to_encoding)("collect")
+    source_name = codecs.lookup(from_encoding).name
+    measure = STATELESS.get(source_name, source_name)
+    passthrough = {source_name, codecs.lookup(to_encoding).name} <= ASCII_COMPATIBLE
+    buffer = bytearray(chunk_size)   # One buffer reused for every read
+    view = memoryview(buffer)
+    offset = 0                       # Source bytes read before this chunk
+    errors = []
+    collected = []
+    token = _conversion_errors.set(collected)
+    try:
+        while True:
+            n = source.readinto(buffer)
+            pending = decoder.getstate()[0]
+            final = not n
+            chunk = view[:n]
+            if passthrough and not pending and not final and (
+                    buffer if n == chunk_size else bytes(chunk)).isascii():
+                sink.write(chunk)        # Same bytes in both encodings
+            else:
+                collected.clear()
+                text = decoder.decode(chunk, final=final)
+                text_start = offset - len(pending)
+                data = pending + bytes(chunk)
+                # (text index, byte index) pairs: where the text starts (after
+                # any byte order mark) and just past each '?' written for an
+                # undecodable sequence, to map encode errors back to bytes
+                skip = 0
+                if text_start == 0:
+                    skip = next((len(bom) for bom in BOMS.get(source_name, ())
+                                 if data.startswith(bom)), 0)
+                if source_name == "utf-8-sig":   # Reports positions after the mark
+                    collected[:] = [(start + skip, end + skip, reason)
+                                    for start, end, reason in collected]
+                anchors = [(0, skip)]
+                for start, end, reason in collected:
+                    errors.append((text_start + start, reason))
+                    t, b = anchors[-1]
+                    anchors.append((t + len(data[b:start].decode(measure)) + 1, end))
+                collected.clear()
+                sink.write(encoder.encode(text, final=final))
+                for start, end, reason in collected:
+                    for position in range(start, end):
+                        t, b = anchors[bisect.bisect_right(anchors, position,
+                                                           key=lambda a: a[0]) - 1]
+                        prefix = len(text[t:position].encode(measure))
+                        errors.append((text_start + b + prefix, reason))
+            if final:
+                return sorted(errors)
+            offset += n
+    finally:
+        _conversion_errors.reset(token)
+
+data = "Price: 10€, café, naïve\n".encode("utf-8")
+sink = io.BytesIO()
+errors = transcode_stream(io.BytesIO(data), sink, "utf-8", "ascii", chunk_size=8)
+print(f"UTF-8 -> ASCII: {sink.getvalue()!r}")
+print(f"Conversion errors (byte offset, reason): {errors}")
+
+# Runs of adjacent bad characters give one '?' and one offset per character,
+# whatever the chunk size; UTF-16 offsets count the byte order mark
+for size in (1, 3, 64):
+    sink = io.BytesIO()
+    errors = transcode_stream(io.BytesIO("x€€y".encode("utf-8")), sink, "utf-8", "ascii", size)
+    assert sink.getvalue() == b"x??y" and [e[0] for e in errors] == [1, 4], (size, errors)
+    sink = io.BytesIO()
+    errors = transcode_stream(io.BytesIO("hé€".encode("utf-16")), sink, "utf-16", "ascii", size)
+    assert sink.getvalue() == b"h??" and [e[0] for e in errors] == [4, 6], (size, errors)
+print("Adjacent errors: 'x€€y' -> b'x??y' with offsets [1, 4] at every chunk size")
+
+# Throughput of each path (pure ASCII input takes the pass-through path)
+samples = {
+    "utf-8": ("naïve café " * 400_000).encode("utf-8"),
+    "latin-1": ("naïve café " * 400_000).encode("latin-1"),
+    "ascii": ("plain text " * 400_000).encode("ascii"),
+}
+for encoding, data in samples.items():
+    start = time.perf_counter()
+    transcode_stream(io.BytesIO(data), io.BytesIO(), encoding, "utf-8")
+    seconds = time.perf_counter() - start
+    print(f"  {encoding} -> utf-8: {len(data) / 1024 / 1024 / seconds:.0f} MB/s")
+
 # =============================================================================
 # 18. STRING IMMUTABILITY
 # =============================================================================
@@ -478,6 +1478,61 @@ print(f"Original unchanged: {original}")
 # Attempting to modify raises an error (uncomment to see)
 # original[0] = 'J'  # TypeError: 'str' object does not support item assignment
 
+# Because strings never change, equal strings can safely share one object.
+# Parsed tokens are new objects each time, so many copies of "US" pile up;
+# an interning pool keeps one copy of each (sys.intern() does the same but
+# never forgets a string, this pool has a size limit)
+class InternPool:
+    """Bounded pool of canonical strings with least-recently-used eviction"""
+
+    def __init__(self, max_size=100_000):
+        self.max_size = max_size
+        self.strings = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        self.bytes_saved = 0
+
+    def intern(self, s):
+        canonical = self.strings.get(s)
+        if canonical is not None:
+            self.strings.move_to_end(s)
+            self.hits += 1
+            if canonical is not s:
+                self.bytes_saved += sys.getsizeof(s)
+            return canonical
+        self.misses += 1
+        self.strings[s] = s
+        if len(self.strings) > self.max_size:
+            self.strings.popitem(last=False)
+            self.evictions += 1
+        return s
+
+    def intern_column(self, column):
+        """Replace every string of a list with its pooled copy, in place"""
+        intern = self.intern
+        column[:] = map(intern, column)
+        return column
+
+    def stats(self):
+        return {"size": len(self.strings), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "bytes_saved": self.bytes_saved}
+
+def measure_memory(build):
+    """Bytes still allocated for the result once build() has returned"""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+raw = ",".join(["US", "FR", "DE", "active", "inactive"] * 20_000)
+pool = InternPool(max_size=1000)
+plain_bytes = measure_memory(lambda: raw.split(","))
+pooled_bytes = measure_memory(lambda: pool.intern_column(raw.split(",")))
+print(f"Plain list of tokens: {plain_bytes / 1024:.0f} KiB")
+print(f"Interned column: {pooled_bytes / 1024:.0f} KiB")
+print(f"Pool stats: {pool.stats()}")
+
 # =============================================================================
 # 19. COMMON STRING USE CASES
 # =============================================================================
@@ -506,11 +1561,93 @@ title = "Python Programming Tutorial 2024"
 slug = title.lower().replace(" ", "-")
 print(f"URL slug: {slug}")
 
+# Reusable slug generator - the translation table is built once, and
+# split()/join() collapses any run of whitespace or punctuation into one "-"
+SLUG_TABLE = str.maketrans({char: " " for char in string.punctuation})
+
+@lru_cache(maxsize=10000)
+def slugify(title):
+    """Return a URL slug for title (repeated titles come from the cache)"""
+    return "-".join(title.lower().translate(SLUG_TABLE).split())
+
+class SlugIndex:
+    """Makes slugs unique by adding -2, -3, ... in O(1) per title"""
+
+    def __init__(self):
+        self.used = set()
+        self.next_suffix = {}   # slug -> next suffix number to try
+
+    def unique(self, slug):
+        if slug not in self.used:
+            self.used.add(slug)
+            return slug
+        n = self.next_suffix.get(slug, 2)
+        while f"{slug}-{n}" in self.used:
+            n += 1
+        self.next_suffix[slug] = n + 1
+        candidate = f"{slug}-{n}"
+        self.used.add(candidate)
+        return candidate
+
+def slugify_many(titles, index=None):
+    """Yield a slug for every title from an iterator, unique if index is given"""
+    for title in titles:
+        slug = slugify(title)
+        yield index.unique(slug) if index is not None else slug
+
+titles = ["Python Tips & Tricks!", "Python tips  and tricks", "Python Tips & Tricks!"]
+print(f"Unique slugs: {list(slugify_many(titles, SlugIndex()))}")
+print(f"Slug cache: {slugify.cache_info()}")
+
 # Phone number formatting
 phone = "1234567890"
 formatted_phone = f"({phone[:3]}) {phone[3:6]}-{phone[6:]}"
 print(f"Formatted phone: {formatted_phone}")
 
+# Normalizing a whole column of phone numbers - one bytes.translate() call
+# deletes every non-digit, bad rows are collected instead of raising
+NON_DIGITS = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+def normalize_phones(phones, first_index=0):
+    """Return (formatted, rejected) for a list of raw phone strings
+
+    formatted has one entry per input row (None for rejected rows) and
+    rejected lists the row indexes, offset by first_index. Cells that are
+    not strings (None, numbers from a loose CSV reader) are rejected too.
+    """
+    formatted = [None] * len(phones)   # Preallocated output column
+    rejected = []
+    for i, phone in enumerate(phones):
+        if not isinstance(phone, str):
+            rejected.append(first_index + i)
+            continue
+        digits = phone.encode("ascii", "ignore").translate(None, NON_DIGITS).decode()
+        if len(digits) == 10:
+            formatted[i] = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+        else:
+            rejected.append(first_index + i)
+    return formatted, rejected
+
+def normalize_phones_parallel(phones, workers=None, chunk_size=100_000):
+    """Normalize chunks of the column across a process pool and merge them"""
+    starts = range(0, len(phones), chunk_size)
+    chunks = [phones[start:start + chunk_size] for start in starts]
+    formatted, rejected = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_formatted, chunk_rejected in pool.map(normalize_phones, chunks, starts):
+            formatted.extend(chunk_formatted)
+            rejected.extend(chunk_rejected)
+    return formatted, rejected
+
+phones = ["123-456-7890", "(555) 010 9999", "12345", None, "555.867.5309"]
+formatted, rejected = normalize_phones(phones)
+print(f"Normalized phones: {formatted}")
+print(f"Rejected rows: {rejected}")
+
+if __name__ == "__main__":
+    formatted, rejected = normalize_phones_parallel(phones * 50_000, chunk_size=50_000)
+    print(f"Parallel: {len(formatted)} rows, {len(rejected)} rejected")
+
 # =============================================================================
 # 20. STRING METHODS SUMMARY TABLE
 # =============================================================================
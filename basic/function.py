@@ -17,6 +17,26 @@ def function_name(parameters):
     return value
 """
 
+import csv
+import functools
+import heapq
+import io
+import itertools
+import math
+import operator
+import os
+import pickle
+import shelve
+import tempfile
+import threading
+import time
+import timeit
+import tracemalloc
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from fractions import Fraction
+
 # ============================================================================
 # 1. BASIC FUNCTION - Without Parameters and Return
 # ============================================================================
@@ -151,6 +171,175 @@ print()
 print_names("Alice", "Bob", "Charlie", "David")
 print()
 
+# sum_all() packs every argument into a tuple and adds floats one at a time,
+# so rounding errors pile up: sum_all(1e16, 1.0, -1e16) is 0.0. math.fsum()
+# rounds only once. RunningStats folds blocks of values with fsum() and keeps
+# each block's sum plus its rounding residual; blocks of ints are added with
+# sum() instead, which is exact at any size, and the two totals are combined
+# through Fraction so the final float is correctly rounded. It merges the per-block mean
+# and variance with Chan's formula, so blocks, streams and worker processes
+# all combine the same way
+class RunningStats:
+    """Count, sum, mean, variance, min and max of values added block by block"""
+
+    def __init__(self):
+        self.count = 0
+        self.ints = 0              # Exact total of the all-int blocks
+        self.partials = []         # Floats whose exact sum is the float total
+        self.m2 = 0.0              # Sum of squared deviations from the mean
+        self.min = self.max = None
+
+    def add(self, block):
+        """Fold a list, array, memoryview or NumPy array into the totals"""
+        n = len(block)
+        if n == 0:
+            return self
+        if hasattr(block, "dtype"):              # NumPy: vectorized min/max/m2
+            lo, hi = block.min().item(), block.max().item()
+            values = block.tolist()
+        else:
+            lo, hi = min(block), max(block)
+            values = block
+        ints, partials = 0, []
+        if isinstance(values[0], int) and type(total := sum(values)) is int:
+            ints = total                         # Only ints: sum() is exact
+            mean = _divide(total, n)
+            # Sum of (x - total/n)**2 in integers, so no rounding or overflow
+            m2 = _as_float(Fraction(sum((x * n - total) ** 2 for x in values), n * n))
+            return self._combine(n, ints, partials, m2, lo, hi)
+        floats = values
+        if isinstance(values, list) and any(isinstance(x, int) for x in values):
+            # fsum() would round big ints to float first, so keep them apart
+            ints = sum(x for x in values if isinstance(x, int))
+            floats = [x for x in values if not isinstance(x, int)]
+        total = _float_total(floats)
+        partials = [total]
+        if math.isfinite(total):                 # inf/nan have no residual
+            partials.append(math.fsum(itertools.chain(floats, (-total,))))
+        if ints:
+            total = _exact_total(ints, partials)
+        mean = total / n
+        if math.isinf(total) and all(map(math.isfinite, values)):
+            mean = math.fsum(x / n for x in values)    # Only the sum overflowed
+        if hasattr(block, "dtype"):
+            m2 = float(((block - mean) ** 2).sum())
+        else:
+            m2 = _float_total([(x - mean) * (x - mean) for x in values])
+        return self._combine(n, ints, partials, m2, lo, hi)
+
+    def merge(self, other):
+        """Fold in another RunningStats, e.g. one computed by a worker process"""
+        if other.count:
+            self._combine(other.count, other.ints, other.partials, other.m2,
+                          other.min, other.max)
+        return self
+
+    def _combine(self, n, ints, partials, m2, lo, hi):
+        if self.count == 0:
+            self.m2, self.min, self.max = m2, lo, hi
+        else:
+            delta = _divide(_exact_total(ints, partials), n) - self.mean
+            self.m2 += m2 + delta * delta * self.count * n / (self.count + n)
+            self.min, self.max = min(self.min, lo), max(self.max, hi)
+        self.count += n
+        self.ints += ints
+        self.partials += partials
+        if len(self.partials) > 64:              # Squash, keeping the residual
+            total = _float_total(self.partials)
+            self.partials = [total]
+            if math.isfinite(total):
+                self.partials.append(math.fsum(self.partials + [-total]))
+        return self
+
+    @property
+    def total(self):
+        """int when only ints were added, otherwise a float"""
+        return _exact_total(self.ints, self.partials)
+
+    @property
+    def mean(self):
+        return _divide(self.total, self.count) if self.count else math.nan
+
+    @property
+    def variance(self):
+        """Population variance, like statistics.pvariance()"""
+        return self.m2 / self.count if self.count else math.nan
+
+    def result(self):
+        return {"count": self.count, "sum": self.total, "mean": self.mean,
+                "variance": self.variance, "min": self.min, "max": self.max}
+
+def _as_float(value):
+    """float(value), saturating to +-inf instead of raising OverflowError"""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+def _divide(total, n):
+    """total / n, correctly rounded for ints and inf when it does not fit a float"""
+    return _as_float(Fraction(total, n)) if isinstance(total, int) else total / n
+
+def _float_total(values):
+    """math.fsum(), falling back to IEEE sum() when the total is inf or nan"""
+    try:
+        return math.fsum(values)
+    except (OverflowError, ValueError):          # Overflow, or inf + -inf
+        return sum(values)
+
+def _exact_total(ints, partials):
+    """Correctly rounded ints + sum(partials); int when there are no floats"""
+    if not partials:
+        return ints
+    if not ints or not all(map(math.isfinite, partials)):
+        return _float_total(partials)
+    return _as_float(Fraction(ints) + sum(map(Fraction, partials)))
+
+def summation(values, block_size=4096):
+    """Exact-sum statistics of a sequence, buffer or lazily consumed iterator"""
+    stats = RunningStats()
+    if isinstance(values, (array, memoryview)) or hasattr(values, "dtype"):
+        view = memoryview(values) if isinstance(values, array) else values
+        for i in range(0, len(view), block_size):
+            stats.add(view[i:i + block_size])    # Slices of views do not copy
+    else:
+        iterator = iter(values)
+        while block := list(itertools.islice(iterator, block_size)):
+            stats.add(block)
+    return stats.result()
+
+def _summation_chunk(chunk, block_size):
+    stats = RunningStats()
+    for i in range(0, len(chunk), block_size):
+        stats.add(chunk[i:i + block_size])
+    return stats
+
+def summation_parallel(values, workers=None, chunk_size=1_000_000, block_size=4096):
+    """summation() of a sequence split across a process pool, merged in order"""
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+    if isinstance(values, memoryview):           # Views cannot be pickled
+        chunks = [array(values.format, chunk) for chunk in chunks]
+    stats = RunningStats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_summation_chunk, chunks, itertools.repeat(block_size)):
+            stats.merge(part)
+    return stats.result()
+
+print(f"sum_all(1e16, 1.0, -1e16): {sum_all(1e16, 1.0, -1e16)}, "
+      f"summation: {summation([1e16, 1.0, -1e16])['sum']}")
+print(f"summation([0.1] * 10): {summation([0.1] * 10)}")
+print(f"summation([10**17, 1]) stays exact for ints: {summation([10**17, 1])['sum']}")
+print(f"summation(generator): {summation(x / 10 for x in range(1, 100_001))}")
+
+samples = array("d", (math.sin(i) * 1e6 + 1e9 for i in range(1_000_000)))
+naive = timeit.timeit(lambda: (sum(samples), min(samples), max(samples)), number=1)
+fused = timeit.timeit(lambda: summation(samples), number=1)
+print(f"1M floats: sum/min/max {naive:.3f}s, summation() with mean/variance {fused:.3f}s")
+
+if __name__ == "__main__":
+    print(f"summation_parallel: {summation_parallel(samples, chunk_size=250_000)}")
+print()
+
 
 # ============================================================================
 # 7. FUNCTION WITH **kwargs (Keyword Variable Arguments)
@@ -230,6 +419,141 @@ print(f"Squared: {squared}")
 print(f"Even numbers: {evens}")
 print()
 
+# list(map(...)) and list(filter(...)) build a full list at every step. A
+# Pipeline only records its stages. When iterated, each stage wraps the one
+# before it in a lazy iterator - the built-in map() and filter() for plain
+# stages, so their loops stay in C - and batch/window stages hold only a few
+# items. Nothing is materialized between stages
+def _batches(items, size):
+    while batch := list(itertools.islice(items, size)):
+        yield batch
+
+def _windows(items, size, step):
+    window = deque(maxlen=size)
+    for i, item in enumerate(items, 1 - size):
+        window.append(item)
+        if i >= 0 and i % step == 0:
+            yield tuple(window)
+
+def _map_chunk(fn, chunk):
+    return list(map(fn, chunk))
+
+def _parallel_map(items, fn, executor, chunk_size, prefetch):
+    """Map chunks on an executor, keeping at most prefetch chunks in flight"""
+    pending = deque()
+    for chunk in _batches(items, chunk_size):
+        pending.append(executor.submit(_map_chunk, fn, chunk))
+        if len(pending) >= prefetch:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+_NO_INITIAL = object()     # reduce() default, so that None can be an initial value
+
+class Pipeline:
+    """Lazy chain of stages over an iterable; nothing runs until it is consumed"""
+
+    def __init__(self, source, stages=()):
+        self.source = source
+        self.stages = stages
+
+    def _then(self, *stage):
+        return Pipeline(self.source, self.stages + (stage,))
+
+    def map(self, fn, executor=None, chunk_size=1024, prefetch=8):
+        """Apply fn to each item; with an executor, chunks run in its workers"""
+        if executor is None:
+            return self._then("map", fn)
+        if chunk_size < 1 or prefetch < 1:
+            raise ValueError(f"chunk_size and prefetch must be at least 1, got {chunk_size}, {prefetch}")
+        return self._then("parallel_map", fn, executor, chunk_size, prefetch)
+
+    def filter(self, predicate):
+        return self._then("filter", predicate)
+
+    def flat_map(self, fn):
+        return self._then("flat_map", fn)
+
+    def batch(self, size):
+        if size < 1:
+            raise ValueError(f"batch size must be at least 1, got {size}")
+        return self._then("batch", size)
+
+    def window(self, size, step=1):
+        if size < 1 or step < 1:
+            raise ValueError(f"window size and step must be at least 1, got {size}, {step}")
+        return self._then("window", size, step)
+
+    def __iter__(self):
+        items = iter(self.source)
+        for kind, *args in self.stages:
+            if kind == "map":
+                items = map(args[0], items)
+            elif kind == "filter":
+                items = filter(args[0], items)
+            elif kind == "flat_map":
+                items = itertools.chain.from_iterable(map(args[0], items))
+            elif kind == "batch":
+                items = _batches(items, *args)
+            elif kind == "window":
+                items = _windows(items, *args)
+            else:                                # parallel_map
+                items = _parallel_map(items, *args)
+        return items
+
+    def reduce(self, fn, initial=_NO_INITIAL):
+        if initial is _NO_INITIAL:
+            return functools.reduce(fn, self)
+        return functools.reduce(fn, self, initial)
+
+    def to_list(self):
+        return list(self)
+
+def collatz_steps(n):
+    """Steps for n to reach 1 under the Collatz rule (a CPU-bound stand-in)"""
+    steps = 0
+    while n != 1:
+        n = 3 * n + 1 if n % 2 else n // 2
+        steps += 1
+    return steps
+
+print(f"Pipeline squares of evens: "
+      f"{Pipeline(numbers).filter(lambda x: x % 2 == 0).map(lambda x: x**2).to_list()}")
+print(f"flat_map + batch: {Pipeline(numbers).flat_map(lambda x: [x] * x).batch(4).to_list()}")
+print(f"window(3) sums: {Pipeline(numbers).window(3).map(sum).to_list()}")
+print(f"window(2, step=2): {Pipeline(range(7)).window(2, step=2).to_list()}")
+print(f"reduce(add): {Pipeline(numbers).map(square).reduce(operator.add, 0)}")
+
+def _eager(n):
+    squares = list(map(lambda x: x * x, range(n)))
+    evens = list(filter(lambda x: x % 2 == 0, squares))
+    return sum(list(map(lambda x: x // 3, evens)))
+
+def _lazy(n):
+    return (Pipeline(range(n)).map(lambda x: x * x).filter(lambda x: x % 2 == 0)
+            .map(lambda x: x // 3).reduce(operator.add, 0))
+
+# 2 * 10**5 items keeps the demo quick; raise count for a full run
+count = 2 * 10**5
+for label, run in (("list(map/filter)", _eager), ("Pipeline", _lazy)):
+    elapsed = timeit.timeit(lambda: run(count), number=1)
+    tracemalloc.start()                          # Traced separately, it slows the run
+    run(count)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label}: {count / elapsed / 1e6:.2f}M items/s, peak {peak / 1024:,.0f} KiB")
+
+if __name__ == "__main__":
+    sequential = timeit.timeit(lambda: Pipeline(range(1, 100_000)).map(collatz_steps)
+                               .reduce(max), number=1)
+    with ProcessPoolExecutor() as pool:
+        parallel = timeit.timeit(lambda: Pipeline(range(1, 100_000))
+                                 .map(collatz_steps, executor=pool, chunk_size=10_000)
+                                 .reduce(max), number=1)
+    print(f"max collatz_steps below 100000: sequential {sequential:.2f}s, "
+          f"process pool {parallel:.2f}s")
+print()
+
 
 # ============================================================================
 # 10. RECURSIVE FUNCTIONS
@@ -266,6 +590,130 @@ print("Countdown from 5:")
 countdown(5)
 print()
 
+# The recursive fibonacci() above recomputes the same values again and again
+# (exponential time) and hits the recursion limit for large n. Fast doubling
+# uses F(2k) = F(k) * (2*F(k+1) - F(k)) and F(2k+1) = F(k)^2 + F(k+1)^2 to
+# get F(n) in O(log n) steps, without recursion
+def fibonacci_fast(n):
+    """Calculate nth Fibonacci number by fast doubling"""
+    if n < 0:
+        raise ValueError("fibonacci_fast() not defined for negative values")
+    a, b = 0, 1                      # F(k), F(k+1) for k = 0
+    for bit in bin(n)[2:]:           # Walk the bits of n from the top
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == "1":
+            a, b = b, a + b
+    return a
+
+def fibonacci_sequence(count):
+    """Return the first count Fibonacci numbers as a list"""
+    sequence = [0] * count           # Allocate once, then fill in
+    a, b = 0, 1
+    for i in range(count):
+        sequence[i] = a
+        a, b = b, a + b
+    return sequence
+
+class FibonacciTable:
+    """Precomputed Fibonacci numbers that can be saved and loaded"""
+
+    def __init__(self, size=1000, values=None):
+        self.values = values if values is not None else fibonacci_sequence(size)
+
+    def __getitem__(self, n):
+        if n < 0:                        # Not list-style wraparound
+            raise IndexError("FibonacciTable index must not be negative")
+        if n < len(self.values):
+            return self.values[n]
+        return fibonacci_fast(n)
+
+    def range(self, start, stop):
+        """Fibonacci numbers F(start) .. F(stop - 1)"""
+        if start < 0:
+            raise ValueError("FibonacciTable.range() start must not be negative")
+        if stop <= len(self.values):
+            return self.values[start:stop]
+        a, b = fibonacci_fast(start), fibonacci_fast(start + 1)
+        result = []
+        for _ in range(start, stop):
+            result.append(a)
+            a, b = b, a + b
+        return result
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self.values, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(values=pickle.load(f))
+
+print(f"Fibonacci (fast doubling) of 7: {fibonacci_fast(7)}")
+print(f"First 10 Fibonacci numbers: {fibonacci_sequence(10)}")
+table = FibonacciTable(100)
+print(f"Fibonacci numbers 20-24 from table: {table.range(20, 25)}")
+
+with tempfile.TemporaryDirectory() as folder:
+    path = os.path.join(folder, "fibonacci.pickle")
+    table.save(path)
+    print(f"Loaded table, F(90) = {FibonacciTable.load(path)[90]}")
+
+# Timing: recursive vs fast doubling
+seconds = timeit.timeit(lambda: fibonacci(25), number=1)
+print(f"Recursive fibonacci(25): {seconds:.4f}s")
+for n in (25, 10**4, 10**6):
+    seconds = timeit.timeit(lambda: fibonacci_fast(n), number=1)
+    print(f"fibonacci_fast({n}): {seconds:.4f}s")
+print()
+
+# factorial() above recurses once per n (RecursionError near n = 1000) and
+# multiplies a huge number by a small one every step. Multiplying in a
+# balanced tree keeps both sides of each multiplication about the same size,
+# which is much faster for big integers. (math.factorial does this in C.)
+SMALL_FACTORIALS = list(itertools.accumulate(range(1, 256), operator.mul, initial=1))
+
+def product_range(low, high):
+    """Product of low * (low + 1) * ... * (high - 1), as a balanced tree"""
+    if high - low <= 16:
+        result = 1
+        for i in range(low, high):
+            result *= i
+        return result
+    middle = (low + high) // 2
+    return product_range(low, middle) * product_range(middle, high)
+
+def factorial_fast(n):
+    """Calculate factorial without one recursive call per n"""
+    if n < 0:
+        raise ValueError("factorial() not defined for negative values")
+    if n < len(SMALL_FACTORIALS):
+        return SMALL_FACTORIALS[n]
+    return product_range(1, n + 1)
+
+def binomial_row(n):
+    """All binomial coefficients C(n, 0) .. C(n, n) in one pass"""
+    row = [1] * (n + 1)
+    for k in range(n // 2):
+        row[k + 1] = row[n - k - 1] = row[k] * (n - k) // (k + 1)
+    return row
+
+def log_factorials(n):
+    """log(0!), log(1!), ..., log(n!) as floats (no big integers at all)"""
+    return list(itertools.accumulate(map(math.log, range(1, n + 1)), initial=0.0))
+
+print(f"Factorial (fast) of 20: {factorial_fast(20)}")
+print(f"Binomial row for n=6: {binomial_row(6)}")
+print(f"log(10!) = {log_factorials(10)[10]:.4f}")
+
+# Timing (raise to 10**5 and 10**6 for a full run - that takes seconds)
+for n in (10**3, 10**4):
+    seconds = timeit.timeit(lambda: factorial_fast(n), number=1)
+    print(f"factorial_fast({n}): {seconds:.4f}s")
+    seconds = timeit.timeit(lambda: math.factorial(n), number=1)
+    print(f"math.factorial({n}): {seconds:.4f}s")
+print()
+
 
 # ============================================================================
 # 11. NESTED FUNCTIONS
@@ -315,6 +763,90 @@ print(f"10 * 5 = {multiplication}")
 print(f"10 / 5 = {division}")
 print()
 
+# Calling arithmetic_operations() per pair leaves four boxed results and a
+# tuple behind for every row. arithmetic_columns() fills four preallocated
+# double columns instead (8 bytes a value) a block at a time with map() over
+# operator functions. Without NumPy that is a memory win, not a speed win:
+# CPython still boxes every operand and result, so it runs at about the speed
+# of the per-call loop (and threads cannot help under the GIL). With NumPy
+# columns the ufuncs run in C and release the GIL, so blocks also run in
+# parallel threads. Zero divisors give NaN where the scalar version gives None
+def _arithmetic_exact(p, q):
+    """One row as floats, for ints too large for a double (results saturate to +-inf)"""
+    if not (isinstance(p, int) and isinstance(q, int)):
+        p, q = _as_float(p), _as_float(q)
+    quotient = _divide(p, q) if q else math.nan
+    return _as_float(p + q), _as_float(p - q), _as_float(p * q), quotient
+
+def _arithmetic_block(a, b, columns, start, stop):
+    sums, diffs, products, quotients = columns
+    x, y = a[start:stop], b[start:stop]
+    if hasattr(x, "dtype"):                      # NumPy: ufuncs write into the views
+        import numpy as np
+        np.add(x, y, out=sums[start:stop])
+        np.subtract(x, y, out=diffs[start:stop])
+        np.multiply(x, y, out=products[start:stop])
+        np.divide(x, y, out=quotients[start:stop], where=y != 0)
+        return
+    # Unbox each value once, not once per column; map() into a list is faster
+    # than handing array() the bare iterator
+    x, y = list(x), list(y)
+    try:
+        block = (array("d", list(map(operator.add, x, y))),
+                 array("d", list(map(operator.sub, x, y))),
+                 array("d", list(map(operator.mul, x, y))),
+                 array("d", list(map(operator.truediv, x,
+                                     [q or math.nan for q in y] if 0 in y else y))))
+    except OverflowError:                        # ints beyond a double: redo the block exactly
+        block = tuple(array("d", column) for column in zip(*map(_arithmetic_exact, x, y)))
+    for column, values in zip(columns, block):
+        column[start:stop] = values
+
+def arithmetic_columns(a, b, workers=None, chunk_size=65536):
+    """Element-wise sum, difference, product and quotient (NaN for / 0) of two columns"""
+    if len(a) != len(b):
+        raise ValueError(f"Columns differ in length: {len(a)} != {len(b)}")
+    n = len(a)
+    if hasattr(a, "dtype"):
+        import numpy as np
+        columns = (np.empty(n), np.empty(n), np.empty(n), np.full(n, np.nan))
+        views = columns
+    else:
+        columns = tuple(array("d", bytes(8 * n)) for _ in range(4))
+        views = tuple(map(memoryview, columns))
+    starts = range(0, n, chunk_size)
+    if workers is None:
+        for start in starts:
+            _arithmetic_block(a, b, views, start, start + chunk_size)
+    else:
+        # Blocks write to disjoint slices, so threads share the outputs safely
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda start: _arithmetic_block(a, b, views, start, start + chunk_size),
+                          starts))
+    return columns
+
+sums, diffs, products, quotients = arithmetic_columns(array("d", [10, 7, 3]), array("d", [5, 0, 4]))
+print(f"arithmetic_columns: sums={sums.tolist()}, diffs={diffs.tolist()}, "
+      f"products={products.tolist()}, quotients={quotients.tolist()}")
+sums, diffs, products, quotients = arithmetic_columns([10**400, 3], [10**400, 0])
+print(f"  huge ints: sums={sums.tolist()}, diffs={diffs.tolist()}, quotients={quotients.tolist()}")
+
+# 2 * 10**5 pairs keeps the demo quick; raise n for a full run
+n = 2 * 10**5
+left = array("d", (i % 1000 + 1 for i in range(n)))
+right = array("d", (i % 7 for i in range(n)))
+per_call = timeit.timeit(lambda: [arithmetic_operations(x, y) for x, y in zip(left, right)],
+                         number=1)
+batched = timeit.timeit(lambda: arithmetic_columns(left, right), number=1)
+tracemalloc.start()
+results = [arithmetic_operations(x, y) for x, y in zip(left, right)]
+per_call_bytes = tracemalloc.get_traced_memory()[0]
+del results
+tracemalloc.stop()
+print(f"{n:,} pairs: per-call {per_call:.3f}s ({per_call_bytes / 2**20:.1f} MiB of tuples), "
+      f"arithmetic_columns {batched:.3f}s ({4 * 8 * n / 2**20:.1f} MiB of columns)")
+print()
+
 name, age, job = get_user_info()
 print(f"Name: {name}, Age: {age}, Job: {job}")
 print()
@@ -368,6 +900,8 @@ def process_numbers(numbers: list[int]) -> int:
 print(greet_typed("Alice"))
 print(f"Area: {calculate_area(5.5, 3.2)}")
 print(f"Sum: {process_numbers([1, 2, 3, 4, 5])}")
+print(f"Sum of ten 0.1s: {process_numbers([0.1] * 10)}, "
+      f"summation(): {summation([0.1] * 10)['sum']}")
 print()
 
 
@@ -477,6 +1011,189 @@ def say_hello():
 say_hello()
 print()
 
+# factorial(), fibonacci(), calculate_power() and is_prime() are pure, so a
+# repeated call can return a stored result instead of recomputing it.
+# functools.lru_cache covers the simple case; memoize() adds expiry, custom
+# keys for unhashable arguments, one computation per key when threads miss at
+# the same time, counters, and an optional shelve file that outlives the process
+def freeze(value):
+    """Hashable stand-in for nested lists, dicts and sets (a memoize() key helper)
+
+    Dict items and set members are sorted (by repr, so mixed types work),
+    which keeps the key and its repr() the same in every process.
+    """
+    if isinstance(value, dict):
+        return (dict, tuple(sorted(((k, freeze(v)) for k, v in value.items()), key=repr)))
+    if isinstance(value, (set, frozenset)):
+        return (set, tuple(sorted(map(freeze, value), key=repr)))
+    if isinstance(value, (list, tuple)):
+        return tuple(map(freeze, value))
+    return value
+
+class _KwargsMark:
+    """Separates positional from keyword arguments in a memoize() key"""
+
+    def __repr__(self):                          # Stable, unlike object()'s repr
+        return "<kwargs>"
+
+_KWARGS = _KwargsMark()
+
+def memoize(maxsize=128, ttl=None, key=None, path=None):
+    """Cache results in LRU order, optionally expiring after ttl seconds and on disk"""
+    def decorator(func):
+        entries = OrderedDict()                  # key -> (expires, value), oldest first
+        pending = {}                             # key -> Future of the call computing it
+        lock = threading.Lock()
+        counts = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "disk_hits": 0}
+        disk = shelve.open(path) if path else None
+        if disk is not None:                     # Drop entries that expired while closed
+            now = time.time()
+            for name in [name for name, (expires, _) in disk.items()
+                         if expires is not None and expires <= now]:
+                del disk[name]
+
+        def remember(k, entry):
+            entries[k] = entry
+            entries.move_to_end(k)
+            if maxsize is not None and len(entries) > maxsize:
+                entries.popitem(last=False)
+                counts["evictions"] += 1
+
+        def lookup(k, now):
+            entry = entries.get(k)
+            if entry is not None:
+                if entry[0] is None or entry[0] > now:
+                    entries.move_to_end(k)
+                    counts["hits"] += 1
+                    return entry
+                del entries[k]
+                counts["expired"] += 1
+            if disk is not None:
+                entry = disk.get(repr(k))
+                if entry is not None:
+                    if entry[0] is None or entry[0] > now:
+                        remember(k, entry)
+                        counts["disk_hits"] += 1
+                        return entry
+                    del disk[repr(k)]
+                    counts["expired"] += 1
+            return None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if key is not None:
+                k = key(*args, **kwargs)
+            elif kwargs:                         # Sorted, so repr(k) is stable on disk
+                k = (*args, _KWARGS, *sorted(kwargs.items()))
+            else:
+                k = args
+            with lock:
+                entry = lookup(k, time.time())
+                if entry is not None:
+                    return entry[1]
+                future = pending.get(k)
+                owner = future is None
+                if owner:
+                    future = pending[k] = Future()
+                    counts["misses"] += 1
+                else:                            # Another thread is computing it
+                    counts["hits"] += 1
+            if not owner:
+                return future.result()
+            try:
+                value = func(*args, **kwargs)
+            except BaseException as exc:
+                with lock:
+                    del pending[k]
+                future.set_exception(exc)
+                raise
+            entry = (None if ttl is None else time.time() + ttl, value)
+            with lock:
+                remember(k, entry)
+                if disk is not None:
+                    disk[repr(k)] = entry
+                del pending[k]
+            future.set_result(value)
+            return value
+
+        def cache_info():
+            with lock:
+                return dict(counts, size=len(entries))
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                counts.update(dict.fromkeys(counts, 0))
+                if disk is not None:
+                    disk.clear()
+
+        def cache_close():
+            if disk is not None:
+                with lock:
+                    disk.close()
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_close = cache_close
+        return wrapper
+    return decorator
+
+# Wrapped under new names: rebinding factorial/fibonacci would send every
+# recursive call through wrapper() and halve the recursion depth they reach
+recursive = timeit.timeit(lambda: fibonacci(25), number=1)
+factorial_cached = memoize(maxsize=1024)(factorial_fast)
+fibonacci_cached = memoize(maxsize=1024)(fibonacci_fast)
+calculate_power_cached = memoize(maxsize=1024)(calculate_power)
+
+cold = timeit.timeit(lambda: fibonacci_cached(25), number=1)
+warm = timeit.timeit(lambda: fibonacci_cached(25), number=1)
+print(f"fibonacci(25): recursive {recursive:.4f}s, fibonacci_cached cold {cold:.6f}s, "
+      f"warm {warm:.6f}s")
+print(f"factorial_cached(20) = {factorial_cached(20)}, again = {factorial_cached(20)}")
+print(f"fibonacci cache: {fibonacci_cached.cache_info()}")
+print(f"factorial cache: {factorial_cached.cache_info()}")
+print(f"calculate_power_cached(2, 100) twice: "
+      f"{calculate_power_cached(2, 100) == calculate_power_cached(2, 100)}, "
+      f"{calculate_power_cached.cache_info()}")
+
+# Eight threads miss on the same key at once; only one of them runs the body
+slow_calls = []
+
+@memoize(ttl=0.05)
+def slow_square(n):
+    """Stand-in for an expensive call"""
+    slow_calls.append(n)
+    time.sleep(0.02)
+    return n * n
+
+with ThreadPoolExecutor(max_workers=8) as pool:
+    results = list(pool.map(slow_square, [12] * 8))
+print(f"8 concurrent slow_square(12): {set(results)}, body ran {len(slow_calls)} time(s)")
+time.sleep(0.06)
+slow_square(12)                                  # Entry is past its ttl
+print(f"After ttl: body ran {len(slow_calls)} times, {slow_square.cache_info()}")
+
+# Lists are unhashable; freeze() turns the argument into a usable key
+@memoize(key=lambda numbers: freeze(numbers))
+def spread(numbers):
+    """Difference between the largest and smallest value"""
+    return max(numbers) - min(numbers)
+
+print(f"spread([3, 9, 4]) twice: {spread([3, 9, 4])}, {spread([3, 9, 4])}, "
+      f"hits={spread.cache_info()['hits']}")
+
+# A second wrapper on the same file plays the part of a restarted process
+with tempfile.TemporaryDirectory() as tmp:
+    cache_file = os.path.join(tmp, "power_cache")
+    first = memoize(path=cache_file)(calculate_power)
+    first(7, 77)
+    first.cache_close()
+    second = memoize(path=cache_file)(calculate_power)
+    second(7, 77)
+    print(f"Disk tier after restart: {second.cache_info()}")
+    second.cache_close()
+print()
+
 
 # ============================================================================
 # 19. PRACTICAL EXAMPLES
@@ -518,6 +1235,247 @@ print(f"Is 18 prime? {is_prime(18)}")
 print(f"25°C = {celsius_to_fahrenheit(25)}°F")
 print(f"Max of [3, 7, 2, 9, 1]: {find_max([3, 7, 2, 9, 1])}")
 print(f"Reverse 'Python': {reverse_string('Python')}")
+
+# is_prime() is pure as well; memoize() from section 18 caches repeated checks
+is_prime_cached = memoize(maxsize=4096)(is_prime)
+print(f"Primes below 30, asked twice: {sum(map(is_prime_cached, range(30)))}, "
+      f"{sum(map(is_prime_cached, range(30)))}, {is_prime_cached.cache_info()}")
+print()
+
+# Checking millions of numbers - trial division costs up to sqrt(n) steps per
+# call. A sieve marks whole ranges at once in a bytearray (one byte per
+# number, crossing out multiples with slice assignment), and Miller-Rabin
+# answers single 64-bit numbers in a few modular exponentiations
+def sieve(limit):
+    """bytearray where flags[i] == 1 if i is prime, for 0 <= i < limit"""
+    flags = bytearray([1]) * limit
+    flags[:2] = b"\x00\x00"[:limit]
+    for p in range(2, math.isqrt(max(limit - 1, 0)) + 1):
+        if flags[p]:
+            flags[p * p::p] = bytes(len(range(p * p, limit, p)))
+    return flags
+
+def primes_in_range(start, stop, segment_size=1 << 16):
+    """Yield the primes start <= p < stop, one sieve segment at a time"""
+    start = max(start, 2)
+    base = sieve(math.isqrt(max(stop - 1, 0)) + 1)
+    base_primes = [p for p in range(len(base)) if base[p]]
+    for low in range(start, stop, segment_size):
+        high = min(low + segment_size, stop)
+        flags = bytearray([1]) * (high - low)
+        for p in base_primes:
+            first = max(p * p, (low + p - 1) // p * p)   # First multiple to cross out
+            if first >= high:
+                continue
+            flags[first - low::p] = bytes(len(range(first, high, p)))
+        for i in itertools.compress(range(low, high), flags):
+            yield i
+
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+def is_prime_fast(n):
+    """Deterministic Miller-Rabin, exact for every n below 2**64"""
+    if n < 2:
+        return False
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def are_prime(numbers, workers=None, chunk_size=10_000):
+    """Check many numbers across a process pool, results in input order"""
+    numbers = list(numbers)
+    chunks = [numbers[i:i + chunk_size] for i in range(0, len(numbers), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [result for chunk in pool.map(_are_prime_chunk, chunks) for result in chunk]
+
+def _are_prime_chunk(numbers):
+    return list(map(is_prime_fast, numbers))
+
+print(f"Primes between 100 and 150: {list(primes_in_range(100, 150))}")
+print(f"Is 2**61 - 1 prime? {is_prime_fast(2**61 - 1)}")
+print(f"Is 2**61 + 1 prime? {is_prime_fast(2**61 + 1)}")
+
+# Process pools re-import this file on Windows/macOS, so only start one here
+if __name__ == "__main__":
+    candidates = range(10**12, 10**12 + 200_000)
+    flags = are_prime(candidates, chunk_size=50_000)
+    print(f"Primes among {len(candidates)} numbers near 10**12: {sum(flags)}")
+print()
+
+# find_max() loops in Python. The built-in max()/min() and heapq run the loop
+# in C, work on lists, array.array and memoryview alike, and NumPy arrays
+# bring their own vectorized methods
+def summarize(values, k=3):
+    """Max, min, their positions and the k largest values of a sequence"""
+    if len(values) == 0:
+        return None
+    if hasattr(values, "argmax"):                # NumPy array
+        largest = values[values.argpartition(-min(k, len(values)))[-k:]]
+        top = sorted(largest.tolist(), reverse=True)[:k]
+        return {"max": values.max().item(), "argmax": int(values.argmax()),
+                "min": values.min().item(), "argmin": int(values.argmin()), "top": top}
+    positions = range(len(values))
+    argmax = max(positions, key=values.__getitem__)
+    argmin = min(positions, key=values.__getitem__)
+    return {"max": values[argmax], "argmax": argmax,
+            "min": values[argmin], "argmin": argmin,
+            "top": heapq.nlargest(k, values)}   # Heap of size k, one pass
+
+def summarize_stream(values, k=3):
+    """Same as summarize(), folding an iterator without storing it"""
+    result = None
+    top = []                                     # Min-heap of the k largest
+    for i, value in enumerate(values):
+        if result is None:
+            result = {"max": value, "argmax": i, "min": value, "argmin": i}
+        elif value > result["max"]:
+            result["max"], result["argmax"] = value, i
+        elif value < result["min"]:
+            result["min"], result["argmin"] = value, i
+        if len(top) < k:
+            heapq.heappush(top, value)
+        elif value > top[0]:
+            heapq.heapreplace(top, value)
+    if result is not None:
+        result["top"] = sorted(top, reverse=True)
+    return result
+
+def _summarize_chunk(chunk, offset, k):
+    result = summarize(chunk, k)
+    result["argmax"] += offset
+    result["argmin"] += offset
+    return result
+
+def summarize_parallel(values, k=3, workers=None, chunk_size=1_000_000):
+    """summarize() on chunks in a process pool, then merge the chunk results"""
+    offsets = range(0, len(values), chunk_size)
+    chunks = [values[i:i + chunk_size] for i in offsets]
+    if isinstance(values, memoryview):           # Views cannot be pickled
+        chunks = [array(values.format, chunk) for chunk in chunks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_summarize_chunk, chunks, offsets, itertools.repeat(k)))
+    if not parts:
+        return None
+    best = max(parts, key=lambda part: part["max"])     # First chunk wins ties
+    worst = min(parts, key=lambda part: part["min"])
+    return {"max": best["max"], "argmax": best["argmax"],
+            "min": worst["min"], "argmin": worst["argmin"],
+            "top": heapq.nlargest(k, itertools.chain.from_iterable(p["top"] for p in parts))}
+
+readings = array("d", [3.5, 7.25, 2.0, 9.75, 1.5, 9.75])
+print(f"summarize(array): {summarize(readings)}")
+print(f"summarize(memoryview): {summarize(memoryview(readings))}")
+print(f"summarize_stream(generator): {summarize_stream(x * x for x in range(-5, 4))}")
+
+if __name__ == "__main__":
+    big = array("d", (math.sin(i) for i in range(2_000_000)))
+    print(f"summarize_parallel: {summarize_parallel(big, chunk_size=500_000)}")
+print()
+
+# celsius_to_fahrenheit() pays a function call and three float operations per
+# reading. Every unit pair here is linear, so it folds into one (scale, offset)
+# pair - one multiply and one add per value - and the kernels below apply it
+# to a whole buffer at once
+UNIT_CONVERSIONS = {}
+
+def register_unit(source, target, scale, offset=0.0):
+    """Register target = value * scale + offset, and its inverse"""
+    UNIT_CONVERSIONS[source, target] = (scale, offset)
+    UNIT_CONVERSIONS[target, source] = (1 / scale, -offset / scale)
+
+register_unit("C", "F", 9 / 5, 32.0)
+register_unit("C", "K", 1.0, 273.15)
+register_unit("F", "K", 5 / 9, 273.15 - 32 * 5 / 9)
+register_unit("m", "ft", 1 / 0.3048)
+register_unit("km", "mi", 1 / 1.609344)
+register_unit("cm", "in", 1 / 2.54)
+register_unit("kg", "lb", 1 / 0.45359237)
+register_unit("g", "oz", 1 / 28.349523125)
+
+def conversion(source, target):
+    """(scale, offset) for a registered unit pair"""
+    if source == target:
+        return 1.0, 0.0
+    try:
+        return UNIT_CONVERSIONS[source, target]
+    except KeyError:
+        raise ValueError(f"No conversion from {source!r} to {target!r}") from None
+
+def convert_inplace(values, source, target, block_size=65536):
+    """Overwrite an array('d'), memoryview or NumPy array with converted values"""
+    scale, offset = conversion(source, target)
+    if hasattr(values, "dtype"):                 # NumPy: vectorized, no copy
+        values *= scale
+        values += offset
+        return values
+    view = memoryview(values)
+    if view.format not in ("d", "f"):
+        raise TypeError(f"convert_inplace() needs float values ('d' or 'f'), got format {view.format!r}")
+    # Converting a block at a time is faster than storing item by item, and
+    # the temporary list never grows past block_size values
+    for i in range(0, len(view), block_size):
+        view[i:i + block_size] = array(view.format, [x * scale + offset for x in view[i:i + block_size]])
+    return values
+
+def convert(values, source, target):
+    """New array('d') (or NumPy array) of converted values; input is untouched"""
+    scale, offset = conversion(source, target)
+    if hasattr(values, "dtype"):
+        return values * scale + offset
+    return array("d", [x * scale + offset for x in values])
+
+def convert_csv_column(source_file, sink, column, source, target, batch_size=10_000):
+    """Stream a CSV, converting one column (header name or index) batch by batch
+
+    Blank lines, short rows and empty cells are written out unchanged.
+    """
+    reader = csv.reader(source_file)
+    writer = csv.writer(sink, lineterminator="\n")
+    if isinstance(column, str):
+        header = next(reader)
+        column = header.index(column)
+        writer.writerow(header)
+    while batch := list(itertools.islice(reader, batch_size)):
+        rows = [row for row in batch if len(row) > column and row[column].strip()]
+        values = convert_inplace(array("d", [float(row[column]) for row in rows]), source, target)
+        for row, value in zip(rows, values):
+            row[column] = repr(round(value, 10))
+        writer.writerows(batch)
+
+print(f"conversion('C', 'F'): {conversion('C', 'F')}")
+temps = array("d", [-40.0, 0.0, 25.0, 100.0])
+print(f"convert(C -> F): {convert(temps, 'C', 'F').tolist()}")
+convert_inplace(memoryview(temps), "C", "K")
+print(f"convert_inplace(memoryview, C -> K): {[round(x, 2) for x in temps]}")
+print(f"convert(kg -> lb): {[round(x, 3) for x in convert([1, 2.5, 70], 'kg', 'lb')]}")
+
+csv_in = io.StringIO("sensor,temp_c\ns1,21.5\ns2,-3.0\n\ns3,\ns4,37.0\n")
+csv_out = io.StringIO()
+convert_csv_column(csv_in, csv_out, "temp_c", "C", "F")
+print(f"convert_csv_column:\n{csv_out.getvalue()}", end="")
+
+# 2 * 10**5 readings keeps the demo quick; raise n for a full run
+n = 2 * 10**5
+celsius = array("d", (i % 400 / 4 for i in range(n)))
+per_call = timeit.timeit(lambda: [celsius_to_fahrenheit(c) for c in celsius], number=3) / 3
+batch = timeit.timeit(lambda: convert(celsius, "C", "F"), number=3) / 3
+in_place = timeit.timeit(lambda: convert_inplace(array("d", celsius), "C", "F"), number=3) / 3
+print(f"{n:,} readings: per-call {per_call:.3f}s, convert() {batch:.3f}s, "
+      f"convert_inplace() {in_place:.3f}s (includes a copy)")
 print()
 
 